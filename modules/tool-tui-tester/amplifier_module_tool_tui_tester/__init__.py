@@ -13,7 +13,7 @@ from amplifier_core.interfaces import Tool
 from amplifier_core.models import ToolResult
 
 from .keys import parse_keys
-from .session_manager import SessionManager
+from .session_manager import CAPTURE_FIELDS, SessionManager
 
 # Re-export for external use
 __all__ = ["TUITerminalTool", "SessionManager", "mount"]
@@ -22,11 +22,15 @@ __all__ = ["TUITerminalTool", "SessionManager", "mount"]
 _session_manager: SessionManager | None = None
 
 
-def get_session_manager() -> SessionManager:
-    """Get or create the global session manager."""
+def get_session_manager(image_format: str = "png") -> SessionManager:
+    """Get or create the global session manager.
+
+    Args:
+        image_format: Capture image format, used only when creating the manager
+    """
     global _session_manager
     if _session_manager is None:
-        _session_manager = SessionManager()
+        _session_manager = SessionManager(image_format=image_format)
     return _session_manager
 
 
@@ -90,6 +94,14 @@ class TUITerminalTool(Tool):
                     "description": "Terminal width in columns (default: 80)",
                     "default": 80,
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": list(CAPTURE_FIELDS)},
+                    "description": (
+                        "Fields to return from capture (default: all). "
+                        'Use ["text"] to skip rendering the screenshot'
+                    ),
+                },
                 "env": {
                     "type": "object",
                     "description": "Additional environment variables",
@@ -214,14 +226,26 @@ class TUITerminalTool(Tool):
                 error=f"Session not found: {session_id}",
             )
 
-        capture = await session.capture()
+        fields = kwargs.get("fields")
+        if fields is not None:
+            if not isinstance(fields, list):
+                return ToolResult(
+                    success=False,
+                    error='Parameter fields must be an array, e.g. ["text"]',
+                )
+            unknown = set(fields) - set(CAPTURE_FIELDS)
+            if unknown:
+                return ToolResult(
+                    success=False,
+                    error=f"Unknown capture fields: {', '.join(sorted(unknown))}",
+                )
+
+        capture = await session.capture(fields=fields)
 
         return ToolResult(
             success=True,
             data={
-                "text": capture["text"],
-                "ansi": capture["ansi"],
-                "image_path": capture["image_path"],
+                **capture,
                 "rows": session.rows,
                 "cols": session.cols,
                 "session_alive": session.is_alive(),
@@ -278,11 +302,12 @@ async def mount(coordinator, config: dict) -> Tool:
 
     Args:
         coordinator: Module coordinator for registration
-        config: Configuration from bundle (session_dir, timeout, etc.)
+        config: Configuration from bundle (session_dir, timeout, image_format, etc.)
 
     Returns:
         The mounted TUI terminal tool instance
     """
+    get_session_manager(image_format=config.get("image_format", "png"))
     tool = TUITerminalTool()
     await coordinator.mount("tools", tool, name="tui_terminal")
     return tool
@@ -100,29 +100,23 @@ def parse_keys(input_string: str) -> bytes:
         >>> parse_keys("{UP}{UP}{ENTER}")
         b'\\x1b[A\\x1b[A\\r'
     """
-    result = bytearray()
-    pos = 0
-
-    for match in SPECIAL_KEY_PATTERN.finditer(input_string):
-        # Add any text before this special key
-        if match.start() > pos:
-            result.extend(input_string[pos : match.start()].encode("utf-8"))
-
-        # Look up the special key
-        key_name = match.group(1).upper()
-        if key_name in SPECIAL_KEYS:
-            result.extend(SPECIAL_KEYS[key_name])
-        else:
-            # Unknown special key - pass through as-is
-            result.extend(f"{{{match.group(1)}}}".encode())
-
-        pos = match.end()
-
-    # Add any remaining text
-    if pos < len(input_string):
-        result.extend(input_string[pos:].encode("utf-8"))
-
-    return bytes(result)
+    # Fast path: plain text has no special keys to expand
+    if "{" not in input_string:
+        return input_string.encode("utf-8")
+
+    # split() with a capture group alternates literal text and key names
+    parts = SPECIAL_KEY_PATTERN.split(input_string)
+    chunks: list[bytes] = []
+
+    for i, part in enumerate(parts):
+        if i % 2:
+            # Look up the special key; unknown keys pass through as-is
+            key_bytes = SPECIAL_KEYS.get(part.upper())
+            chunks.append(key_bytes if key_bytes is not None else f"{{{part}}}".encode())
+        elif part:
+            chunks.append(part.encode("utf-8"))
+
+    return b"".join(chunks)
 
 
 def get_available_keys() -> list[str]:
@@ -7,19 +7,62 @@ Manages the lifecycle of terminal sessions including:
 """
 
 import asyncio
+import codecs
+import fcntl
 import os
-import pty
-import select
+import secrets
 import signal
-import uuid
+import struct
+import termios
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pyte
 from PIL import Image, ImageDraw, ImageFont
 
+# struct winsize (rows, cols, xpixel, ypixel) for the TIOCSWINSZ ioctl
+WINSIZE = struct.Struct("HHHH")
+
+# Monospace fonts tried in order when rendering captures
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "/usr/share/fonts/TTF/DejaVuSansMono.ttf",
+    "/System/Library/Fonts/Monaco.ttf",
+    "C:\\Windows\\Fonts\\consola.ttf",
+]
+FONT_SIZE = 14
+
+# PTY buffers are typically 64 KiB, so one read usually drains them
+READ_CHUNK_SIZE = 65536
+
+# Fields capture() can produce
+CAPTURE_FIELDS = ("text", "ansi", "image_path")
+
+# Supported capture image formats; BMP and PPM are uncompressed and fastest to write
+IMAGE_FORMATS = ("png", "bmp", "ppm")
+
+# Upper bound on reads per drain so a child that never stops writing can't stall us
+MAX_READS_PER_DRAIN = 100
+
+# Seconds batched send() writes are held so they can go out in one write
+WRITE_COALESCE_DELAY = 0.005
+
+# Cap on buffered raw output kept between send/pump_output calls
+MAX_PENDING_OUTPUT = 1024 * 1024
+
+
+# Shell prologue run as `sh -c SPAWN_SCRIPT sh <tty path> <command>`. The child starts
+# in a new session (start_new_session=True) without a controlling terminal; opening
+# the PTY slave by name makes it the controlling tty, so keys like {CTRL+C} are turned
+# into signals by the line discipline. Doing this in the shell keeps Python code out
+# of the forked child, which isn't safe with the I/O pool's threads running.
+SPAWN_SCRIPT = 'exec 3<>"$1" && exec 3>&- && exec /bin/sh -c "$2"'
+
 
 @dataclass
 class TUISession:
@@ -30,112 +73,265 @@ class TUISession:
     rows: int
     cols: int
     pid: int
+    process: asyncio.subprocess.Process
     fd: int  # File descriptor for the PTY
     screen: pyte.Screen
     stream: pyte.Stream
     session_dir: Path
+    font: ImageFont.FreeTypeFont | ImageFont.ImageFont  # Shared, loaded once by the manager
+    fb_pool: dict[tuple[int, int], list[np.ndarray]]  # Free framebuffers keyed by (rows, cols)
+    io_pool: ThreadPoolExecutor  # Shared by the manager for blocking file/ioctl work
+    image_format: str = "png"  # One of IMAGE_FORMATS
     created_at: datetime = field(default_factory=datetime.now)
     capture_count: int = 0
+    # Pre-rasterized glyph tiles keyed by (char, fg color)
+    _glyph_cache: dict[tuple[str, tuple[int, int, int]], np.ndarray] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # Output drained by the event-loop reader, not yet consumed by a caller
+    _pending_output: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    _loop: asyncio.AbstractEventLoop | None = field(default=None, init=False, repr=False)
+    # Input waiting to be written, coalesced across batched send() calls
+    _pending_write: bytearray = field(default_factory=bytearray, init=False, repr=False)
+    _write_flush_handle: asyncio.TimerHandle | None = field(default=None, init=False, repr=False)
+    _writer_registered: bool = field(default=False, init=False, repr=False)
+    # Keeps multibyte UTF-8 sequences split across reads intact
+    _decoder: codecs.IncrementalDecoder = field(
+        default_factory=lambda: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        init=False,
+        repr=False,
+    )
+    # Bumped whenever output is fed to the screen; lets capture() reuse the last image
+    _screen_version: int = field(default=0, init=False, repr=False)
+    _rendered_version: int | None = field(default=None, init=False, repr=False)
+    _last_image_path: Path | None = field(default=None, init=False, repr=False)
+    # Rows changed since they were last rendered / turned into text
+    _render_dirty: set[int] = field(default_factory=set, init=False, repr=False)
+    _text_dirty: set[int] = field(default_factory=set, init=False, repr=False)
+    # Right-trimmed text of each row, refreshed only for dirty rows
+    _row_text: list[str] = field(default_factory=list, init=False, repr=False)
+    _joined_text: str | None = field(default=None, init=False, repr=False)
+    # Framebuffer taken from fb_pool on first render; holds the last rendered screen
+    _fb: np.ndarray | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._row_text = [""] * self.rows
+        # Nothing has been captured yet, so every row needs its text built
+        self._text_dirty.update(range(self.rows))
 
     def is_alive(self) -> bool:
         """Check if the process is still running."""
-        try:
-            os.kill(self.pid, 0)
-            return True
-        except OSError:
-            return False
-
-    async def send(self, data: bytes, wait_ms: int = 100) -> None:
-        """Send data to the terminal."""
-        os.write(self.fd, data)
-        # Wait for output to be generated
-        await asyncio.sleep(wait_ms / 1000.0)
-        # Read any available output
-        self._read_output()
+        # returncode is filled in by asyncio's child watcher once the process exits
+        return self.process.returncode is None
 
-    def _read_output(self, timeout: float = 0.1, max_reads: int = 100) -> bytes:
-        """Read available output from the terminal.
+    async def send(self, data: bytes, wait_ms: int = 100, batch: bool = False) -> None:
+        """Send data to the terminal.
 
         Args:
-            timeout: Timeout for each select call
-            max_reads: Maximum number of read iterations to prevent infinite loops
+            data: Bytes to write
+            wait_ms: Milliseconds to wait for output afterwards
+            batch: Buffer the write and flush it together with any other batched
+                sends made within WRITE_COALESCE_DELAY. The wait is then at least
+                that long, so the data has been written when this returns.
         """
-        output = bytearray()
-        reads = 0
+        self._pending_output.clear()
+        self._pending_write.extend(data)
+        if batch:
+            if self._write_flush_handle is None:
+                loop = asyncio.get_running_loop()
+                self._write_flush_handle = loop.call_later(WRITE_COALESCE_DELAY, self._flush_write)
+            wait_seconds = max(wait_ms / 1000.0, WRITE_COALESCE_DELAY)
+        else:
+            # Flushes earlier batched data too, so ordering is preserved
+            self._flush_write()
+            wait_seconds = wait_ms / 1000.0
+        # Output is drained by the event-loop reader while we wait
+        await asyncio.sleep(wait_seconds)
 
-        while reads < max_reads:
-            reads += 1
-            # Check if data is available
-            ready, _, _ = select.select([self.fd], [], [], timeout)
-            if not ready:
-                break
+    def _flush_write(self) -> None:
+        """Write all buffered input to the PTY in as few syscalls as possible.
 
+        The fd is non-blocking, so if the PTY input buffer fills up the rest is
+        written from an event-loop writer callback once it drains.
+        """
+        if self._write_flush_handle is not None:
+            self._write_flush_handle.cancel()
+            self._write_flush_handle = None
+
+        while self._pending_write:
             try:
-                chunk = os.read(self.fd, 8192)
-                if not chunk:
-                    break
-                output.extend(chunk)
-                # Feed to pyte screen
-                self.stream.feed(chunk.decode("utf-8", errors="replace"))
+                written = os.write(self.fd, self._pending_write)
+            except BlockingIOError:
+                if not self._writer_registered:
+                    asyncio.get_running_loop().add_writer(self.fd, self._flush_write)
+                    self._writer_registered = True
+                return
             except OSError:
+                self._pending_write.clear()
+                self._stop_writer()
+                raise
+            del self._pending_write[:written]
+
+        self._stop_writer()
+
+    def _stop_writer(self) -> None:
+        """Unregister the pending-write callback and any scheduled flush."""
+        if self._write_flush_handle is not None:
+            self._write_flush_handle.cancel()
+            self._write_flush_handle = None
+        if self._writer_registered:
+            asyncio.get_running_loop().remove_writer(self.fd)
+            self._writer_registered = False
+
+    def _start_reader(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Register the PTY fd with the event loop so output is drained as it arrives."""
+        loop.add_reader(self.fd, self._read_output)
+        self._loop = loop
+
+    def _stop_reader(self) -> None:
+        """Unregister the PTY fd from the event loop, if registered."""
+        if self._loop is not None:
+            self._loop.remove_reader(self.fd)
+            self._loop = None
+
+    def _read_output(self) -> bytes:
+        """Drain all currently available output from the terminal.
+
+        Called by the event loop whenever the PTY is readable, and directly
+        before a capture. The PTY fd is non-blocking, so this reads until the
+        kernel buffer is empty without waiting for more data.
+        """
+        output = bytearray()
+
+        for _ in range(MAX_READS_PER_DRAIN):
+            try:
+                chunk = os.read(self.fd, READ_CHUNK_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                # EIO once the child has exited; stop the reader from spinning
+                self._stop_reader()
                 break
+            if not chunk:
+                self._stop_reader()
+                break
+            output.extend(chunk)
+
+        if output:
+            # Decode and feed the whole burst to pyte in one go
+            self.stream.feed(self._decoder.decode(output))
+            self._screen_version += 1
+            self._pending_output.extend(output)
+            # Keep only the most recent output if nobody is consuming it
+            if len(self._pending_output) > MAX_PENDING_OUTPUT:
+                del self._pending_output[:-MAX_PENDING_OUTPUT]
 
         return bytes(output)
 
-    async def pump_output(
-        self, duration_seconds: float = 1.0, poll_interval: float = 0.05
-    ) -> bytes:
-        """Continuously read output for a duration (for TUI apps that render async).
+    async def pump_output(self, duration_seconds: float = 1.0) -> bytes:
+        """Collect output for a duration (for TUI apps that render async).
 
         Args:
-            duration_seconds: How long to pump output
-            poll_interval: How often to poll for data
+            duration_seconds: How long to collect output
 
         Returns:
             All output read during the duration
         """
-        import time
-
-        output = bytearray()
-        end_time = time.time() + duration_seconds
-
-        while time.time() < end_time:
-            chunk = self._read_output(timeout=poll_interval, max_reads=10)
-            if chunk:
-                output.extend(chunk)
-            await asyncio.sleep(poll_interval)
-
-        return bytes(output)
-
-    async def capture(self) -> dict[str, Any]:
-        """Capture current terminal state."""
-        # Read any pending output first
+        self._pending_output.clear()
+        await asyncio.sleep(duration_seconds)
         self._read_output()
 
-        # Get text representation
-        text_lines = []
-        for line in self.screen.display:
-            text_lines.append(line.rstrip())
-        text = "\n".join(text_lines)
+        output = bytes(self._pending_output)
+        self._pending_output.clear()
+        return output
 
-        # Get ANSI representation (simplified - just the text for now)
-        ansi = text  # Could enhance to preserve colors
+    async def capture(self, fields: Collection[str] | None = None) -> dict[str, Any]:
+        """Capture current terminal state.
 
-        # Render to image
-        self.capture_count += 1
-        image_path = self.session_dir / f"capture_{self.capture_count:04d}.png"
-        self._render_image(image_path)
+        Args:
+            fields: Subset of CAPTURE_FIELDS to produce. Defaults to all of them;
+                leaving out "image_path" skips rendering entirely.
 
-        return {
-            "text": text,
-            "ansi": ansi,
-            "image_path": str(image_path),
-        }
+        Returns:
+            Dict with the requested fields
+        """
+        if fields is None:
+            fields = CAPTURE_FIELDS
 
-    def _render_image(self, path: Path) -> None:
-        """Render the terminal screen to a PNG image."""
+        # Drain anything the event-loop reader hasn't picked up yet
+        self._read_output()
+        self._pending_output.clear()
+
+        self._collect_dirty_rows()
+
+        image_path: Path | None = None
+        if "image_path" in fields:
+            # Render to image, unless nothing has been fed to the screen since the last one
+            if self._rendered_version == self._screen_version and self._last_image_path:
+                image_path = self._last_image_path
+            else:
+                self.capture_count += 1
+                image_path = (
+                    self.session_dir / f"capture_{self.capture_count:04d}.{self.image_format}"
+                )
+                # The reader keeps feeding the screen during the save below, so
+                # remember which version this image actually shows
+                version = self._screen_version
+                # Also refreshes the cached text of every row it redraws
+                image = self._render_image()
+                # Encoding is the slow part; keep it off the event loop
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self.io_pool, self._save_image, image, image_path)
+                # A concurrent capture may have saved a newer image meanwhile
+                if self._rendered_version is None or version >= self._rendered_version:
+                    self._rendered_version = version
+                    self._last_image_path = image_path
+
+        result: dict[str, Any] = {}
+
+        if "text" in fields or "ansi" in fields:
+            # Get text representation
+            text = self._screen_text()
+
+            if "text" in fields:
+                result["text"] = text
+            if "ansi" in fields:
+                # Get ANSI representation (simplified - just the text for now)
+                result["ansi"] = text  # Could enhance to preserve colors
+
+        if image_path is not None:
+            result["image_path"] = str(image_path)
+
+        return result
+
+    def _collect_dirty_rows(self) -> None:
+        """Move pyte's dirty rows into the pending render and text refresh sets."""
+        dirty = self.screen.dirty
+        if dirty:
+            rows = {row for row in dirty if row < self.rows}
+            self._render_dirty |= rows
+            self._text_dirty |= rows
+            dirty.clear()
+
+    def _row_text_from_cells(self, row_idx: int, cells: list[pyte.screens.Char]) -> None:
+        """Cache the right-trimmed text of a row from its cells."""
+        self._row_text[row_idx] = "".join(char_data.data for char_data in cells).rstrip()
+        self._text_dirty.discard(row_idx)
+        self._joined_text = None
+
+    def _screen_text(self) -> str:
+        """Return the screen text, walking only rows changed since they were last cached."""
+        for row_idx in list(self._text_dirty):
+            row = self.screen.buffer[row_idx]
+            self._row_text_from_cells(row_idx, [row[col_idx] for col_idx in range(self.cols)])
+        # Join once and reuse the string until a row changes
+        if self._joined_text is None:
+            self._joined_text = "\n".join(self._row_text)
+        return self._joined_text
+
+    def _render_image(self) -> Image.Image:
+        """Render the terminal screen to an image."""
         # Configuration
-        font_size = 14
         char_width = 8  # Approximate for monospace
         char_height = 16
         padding = 10
@@ -148,27 +344,15 @@ class TUISession:
         bg_color = (30, 30, 30)  # Dark gray
         fg_color = (220, 220, 220)  # Light gray
 
-        image = Image.new("RGB", (img_width, img_height), bg_color)
-        draw = ImageDraw.Draw(image)
-
-        # Try to load a monospace font, fall back to default
-        try:
-            # Try common system font paths
-            font_paths = [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
-                "/usr/share/fonts/TTF/DejaVuSansMono.ttf",
-                "/System/Library/Fonts/Monaco.ttf",
-                "C:\\Windows\\Fonts\\consola.ttf",
-            ]
-            font = None
-            for fp in font_paths:
-                if os.path.exists(fp):
-                    font = ImageFont.truetype(fp, font_size)
-                    break
-            if font is None:
-                font = ImageFont.load_default()
-        except Exception:
-            font = ImageFont.load_default()
+        # The framebuffer persists across captures, so only dirty rows are redrawn.
+        # A freshly acquired one may hold stale pixels and needs a full redraw.
+        fb = self._fb
+        if fb is None:
+            fb = self._acquire_framebuffer(img_height, img_width, bg_color)
+            dirty_rows = range(self.rows)
+        else:
+            dirty_rows = sorted(self._render_dirty)
+        self._render_dirty.clear()
 
         # Define ANSI colors
         colors = {
@@ -183,29 +367,34 @@ class TUISession:
             "white": (229, 229, 229),
         }
 
-        # Render each character
-        for row_idx, row in enumerate(self.screen.buffer.values()):
+        # Render the dirty rows: map each cell to a glyph slot, gather the slot
+        # tiles with one fancy-index per row, and blit the whole row at once.
+        # The same cells refresh the row's cached text, so capture() needn't re-walk it.
+        row_width = self.cols * char_width
+        for row_idx in dirty_rows:
+            row = self.screen.buffer[row_idx]
+            cells = [row[col_idx] for col_idx in range(self.cols)]
+            self._row_text_from_cells(row_idx, cells)
+            slots: dict[tuple[str, str], int] = {}
+            cell_slots = [
+                slots.setdefault((char_data.data, char_data.fg), len(slots)) for char_data in cells
+            ]
+            # Bold is not rendered yet; glyphs are keyed by char and fg color only
+            tiles = np.stack(
+                [
+                    self._get_glyph(
+                        char, colors.get(fg, fg_color), bg_color, char_width, char_height
+                    )
+                    for char, fg in slots
+                ]
+            )
+            # (cols, h, w, 3) -> (h, cols * w, 3)
+            row_pixels = tiles[cell_slots].transpose(1, 0, 2, 3).reshape(char_height, row_width, 3)
             y = padding + (row_idx * char_height)
+            fb[y : y + char_height, padding : padding + row_width] = row_pixels
 
-            for col_idx in range(self.cols):
-                char_data = row.get(col_idx)
-                if char_data is None:
-                    continue
-
-                char = char_data.data if char_data.data else " "
-                x = padding + (col_idx * char_width)
-
-                # Get foreground color
-                fg = char_data.fg if hasattr(char_data, "fg") else "default"
-                color = colors.get(fg, fg_color)
-
-                # Handle bold
-                if hasattr(char_data, "bold") and char_data.bold:
-                    # Could use bold font variant
-                    pass
-
-                # Draw character
-                draw.text((x, y), char, fill=color, font=font)
+        image = Image.fromarray(fb)
+        draw = ImageDraw.Draw(image)
 
         # Draw cursor if visible
         cursor_y = self.screen.cursor.y
@@ -218,51 +407,129 @@ class TUISession:
         ]
         draw.rectangle(cursor_rect, outline=(100, 100, 200))
 
-        # Save image
-        path.parent.mkdir(parents=True, exist_ok=True)
-        image.save(path, "PNG")
+        return image
 
-    def close(self) -> None:
+    def _save_image(self, image: Image.Image, path: Path) -> None:
+        """Write a rendered capture to disk in the session's image format.
+
+        Captures are short-lived debug artifacts, so PNG uses fast compression,
+        and BMP/PPM skip compression altogether.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.image_format == "ppm":
+            # Binary PPM is just a tiny header followed by the raw RGB bytes
+            header = b"P6\n%d %d\n255\n" % image.size
+            path.write_bytes(header + image.tobytes())
+        elif self.image_format == "bmp":
+            image.save(path, "BMP")
+        else:
+            image.save(path, "PNG", compress_level=1)
+
+    def _acquire_framebuffer(
+        self, height: int, width: int, bg_color: tuple[int, int, int]
+    ) -> np.ndarray:
+        """Take a framebuffer from the shared pool (or allocate one) for this session."""
+        free = self.fb_pool.get((self.rows, self.cols))
+        fb = free.pop() if free else np.empty((height, width, 3), np.uint8)
+        fb[:] = bg_color
+        self._fb = fb
+        return fb
+
+    def _release_framebuffer(self) -> None:
+        """Return this session's framebuffer to the shared pool."""
+        if self._fb is not None:
+            self.fb_pool.setdefault((self.rows, self.cols), []).append(self._fb)
+            self._fb = None
+
+    def _get_glyph(
+        self,
+        char: str,
+        color: tuple[int, int, int],
+        bg_color: tuple[int, int, int],
+        char_width: int,
+        char_height: int,
+    ) -> np.ndarray:
+        """Return the cell-sized tile for a glyph, rasterizing and caching it on first use."""
+        glyph = self._glyph_cache.get((char, color))
+        if glyph is not None:
+            return glyph
+        tile = Image.new("RGB", (char_width, char_height), bg_color)
+        ImageDraw.Draw(tile).text((0, 0), char, fill=color, font=self.font)
+        glyph = np.asarray(tile)
+        self._glyph_cache[(char, color)] = glyph
+        return glyph
+
+    async def close(self) -> None:
         """Close the session and clean up."""
+        self._stop_reader()
+        self._stop_writer()
+        self._pending_write.clear()
+        self._release_framebuffer()
+        # Flush any dangling partial sequence as a replacement char
+        self.stream.feed(self._decoder.decode(b"", final=True))
         try:
             os.close(self.fd)
         except OSError:
             pass
 
         if self.is_alive():
+            # Signal via os.kill rather than process.terminate()/kill(): those poll()
+            # first, which can reap the child (e.g. one just killed by SIGHUP from
+            # closing the PTY) before asyncio's child watcher sees its exit status.
+            # ProcessLookupError means the watcher has reaped it but hasn't set
+            # returncode yet; every path still waits so close() returns after it has.
             try:
                 os.kill(self.pid, signal.SIGTERM)
-                # Give it a moment to terminate
-                for _ in range(10):
-                    try:
-                        os.kill(self.pid, 0)
-                        import time
-
-                        time.sleep(0.1)
-                    except OSError:
-                        break
-                else:
-                    # Force kill if still alive
-                    os.kill(self.pid, signal.SIGKILL)
-            except OSError:
+            except ProcessLookupError:
                 pass
+            # Give it a moment to terminate
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=1.0)
+            except TimeoutError:
+                # Force kill if still alive
+                try:
+                    os.kill(self.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await self.process.wait()
 
 
 class SessionManager:
     """Manages multiple TUI terminal sessions."""
 
-    def __init__(self, base_dir: Path | None = None):
+    def __init__(self, base_dir: Path | None = None, image_format: str = "png"):
         """Initialize the session manager.
 
         Args:
             base_dir: Base directory for session data. Defaults to ~/.amplifier/tui-sessions
+            image_format: Capture image format, one of IMAGE_FORMATS. Defaults to "png"
         """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(
+                f"Unsupported image format: {image_format} (expected one of {IMAGE_FORMATS})"
+            )
+        self.image_format = image_format
+
         if base_dir is None:
             base_dir = Path.home() / ".amplifier" / "tui-sessions"
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
         self._sessions: dict[str, TUISession] = {}
+        self._font = self._load_font()
+        self._fb_pool: dict[tuple[int, int], list[np.ndarray]] = {}
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tui-io")
+
+    @staticmethod
+    def _load_font() -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+        """Load a monospace font for rendering, falling back to the PIL default."""
+        try:
+            for fp in FONT_PATHS:
+                if os.path.exists(fp):
+                    return ImageFont.truetype(fp, FONT_SIZE)
+        except Exception:
+            pass
+        return ImageFont.load_default()
 
     async def spawn(
         self,
@@ -282,7 +549,9 @@ class SessionManager:
         Returns:
             The created TUISession
         """
-        session_id = str(uuid.uuid4())[:8]
+        session_id = secrets.token_hex(4)
+        while session_id in self._sessions:
+            session_id = secrets.token_hex(4)
         session_dir = self.base_dir / session_id
         session_dir.mkdir(parents=True, exist_ok=True)
 
@@ -298,41 +567,62 @@ class SessionManager:
         screen = pyte.Screen(cols, rows)
         stream = pyte.Stream(screen)
 
-        # Fork a pseudo-terminal
-        pid, fd = pty.fork()
-
-        if pid == 0:
-            # Child process
-            os.execvpe("/bin/sh", ["/bin/sh", "-c", command], spawn_env)
-        else:
-            # Parent process
-            # Set terminal size
-            import fcntl
-            import struct
-            import termios
-
-            winsize = struct.pack("HHHH", rows, cols, 0, 0)
-            fcntl.ioctl(fd, termios.TIOCSWINSZ, winsize)
-
-            session = TUISession(
-                id=session_id,
-                command=command,
-                rows=rows,
-                cols=cols,
-                pid=pid,
-                fd=fd,
-                screen=screen,
-                stream=stream,
-                session_dir=session_dir,
+        # Open a pseudo-terminal; the child gets the slave end as its controlling tty
+        fd, slave_fd = os.openpty()
+        try:
+            # Set terminal size before the child can query it
+            winsize = WINSIZE.pack(rows, cols, 0, 0)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._io_pool, fcntl.ioctl, fd, termios.TIOCSWINSZ, winsize)
+
+            # Make reads non-blocking so output can be drained without select()
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+            process = await asyncio.create_subprocess_exec(
+                "/bin/sh",
+                "-c",
+                SPAWN_SCRIPT,
+                "sh",
+                os.ttyname(slave_fd),
+                command,
+                stdin=slave_fd,
+                stdout=slave_fd,
+                stderr=slave_fd,
+                env=spawn_env,
+                start_new_session=True,
             )
-
-            self._sessions[session_id] = session
-
-            # Give the process a moment to start and produce initial output
-            await asyncio.sleep(0.5)
-            session._read_output()
-
-            return session
+        except BaseException:
+            os.close(fd)
+            raise
+        finally:
+            # Only the child needs the slave end
+            os.close(slave_fd)
+
+        session = TUISession(
+            id=session_id,
+            command=command,
+            rows=rows,
+            cols=cols,
+            pid=process.pid,
+            process=process,
+            fd=fd,
+            screen=screen,
+            stream=stream,
+            session_dir=session_dir,
+            font=self._font,
+            fb_pool=self._fb_pool,
+            io_pool=self._io_pool,
+            image_format=self.image_format,
+        )
+
+        self._sessions[session_id] = session
+        session._start_reader(loop)
+
+        # Give the process a moment to start and produce initial output
+        await asyncio.sleep(0.5)
+
+        return session
 
     def get(self, session_id: str) -> TUISession | None:
         """Get a session by ID."""
@@ -346,7 +636,7 @@ class SessionManager:
         """
         session = self._sessions.pop(session_id, None)
         if session:
-            session.close()
+            await session.close()
             return True
         return False
 
@@ -361,6 +651,10 @@ class SessionManager:
             Number of sessions cleaned up
         """
         dead = [sid for sid, s in self._sessions.items() if not s.is_alive()]
-        for sid in dead:
-            await self.close(sid)
+        await asyncio.gather(*(self.close(sid) for sid in dead))
         return len(dead)
+
+    async def shutdown(self) -> None:
+        """Close all sessions and stop the I/O thread pool."""
+        await asyncio.gather(*(self.close(sid) for sid in list(self._sessions)))
+        self._io_pool.shutdown(wait=False)